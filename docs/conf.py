@@ -40,9 +40,17 @@ autodoc_default_options = {
     "show-inheritance": True,
 }
 
-nb_execution_mode = "off"         # "auto", "off", "force", or "cache"
-# nb_execution_cache_path = ".jupyter_cache"  # default; nice to keep env tidy
-# nb_execution_timeout = 180        # seconds per cell (tune as needed)
+# Notebook execution, "auto", "off", "force", or "cache".
+# Off by default for fast builds; e.g. `NB_EXEC=cache make html` executes the notebooks
+# and keeps the results in a jupyter-cache, so only modified notebooks are re-run.
+# `SKIP_NOTEBOOKS=1` excludes the notebooks from the build altogether.
+nb_execution_mode = os.environ.get("NB_EXEC", "off")
+# Anchored to docs/, so builds from any working directory share one cache
+nb_execution_cache_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".jupyter_cache")
+nb_execution_timeout = 180        # seconds per cell (tune as needed)
+
+if os.environ.get("SKIP_NOTEBOOKS", "0").lower() not in ("0", "", "false"):
+    exclude_patterns.append("**/*.ipynb")
 
 myst_enable_extensions = [
     "amsmath",
@@ -3,10 +3,39 @@ The class names have a `Impl` suffix to avoid conflicts with the `DynData` and `
 defined in `dymad.data.__init__.py`. This avoids confusion in Sphinx in documentation generation.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import torch
 from typing import List, Union
 
+def _fuse_stack(xs: List[torch.Tensor], us: List[torch.Tensor]) -> torch.Tensor:
+    """
+    Stack state and control samples into one preallocated buffer of shape
+    (batch_size, ..., n_features + n_controls), one copy per half.
+    """
+    assert xs[0].dtype == us[0].dtype, \
+        f"State and control dtypes must match for a fused buffer. Got {xs[0].dtype} and {us[0].dtype}."
+    nx = xs[0].shape[-1]
+    xu = torch.empty(len(xs), *xs[0].shape[:-1], nx + us[0].shape[-1],
+                     dtype=xs[0].dtype, device=xs[0].device)
+    xu[..., :nx].copy_(torch.stack(xs, dim=0))
+    xu[..., nx:].copy_(torch.stack(us, dim=0))
+    return xu
+
+def _is_fused(data) -> bool:
+    """True if `x` and `u` of `data` are still the views of `xu` created at construction."""
+    views = data.__dict__.get('_views', None)
+    return data.xu is not None and views is not None and views[0] is data.x and views[1] is data.u
+
+def _can_fuse(batch_list) -> bool:
+    """True if the samples have controls of the same dtype as the states."""
+    return batch_list[0].u is not None and batch_list[0].u.dtype == batch_list[0].x.dtype
+
+def _features(data) -> torch.Tensor:
+    """Concatenated state and control features of `data`; `xu` itself if fused."""
+    if _is_fused(data):
+        return data.xu
+    return torch.cat([data.x, data.u], dim=-1)
+
 @dataclass
 class DynDataImpl:
     """
@@ -18,6 +47,40 @@ class DynDataImpl:
     u: Union[torch.Tensor, None]
     """u (torch.Tensor): Control tensor of shape (batch_size, n_steps, n_controls)."""
 
+    xu: Union[torch.Tensor, None] = field(default=None, repr=False)
+    """xu (torch.Tensor): Optional fused buffer of shape (batch_size, n_steps, n_features + n_controls).
+    When set, `x` and `u` are views into it, so in-place updates write through."""
+
+    @classmethod
+    def fused(cls, xu: torch.Tensor, n_features: int) -> "DynDataImpl":
+        """
+        Create a DynData whose state and control tensors are views of `xu`.
+
+        Args:
+            xu (torch.Tensor): Fused buffer of shape (..., n_features + n_controls).
+            n_features (int): Number of state features, i.e., the split point.
+
+        Returns:
+            DynData: A DynData instance backed by `xu`.
+        """
+        return cls(xu[..., :n_features], xu[..., n_features:], xu)
+
+    def __post_init__(self):
+        if self.xu is not None:
+            self._views = (self.x, self.u)
+
+    def is_fused(self) -> bool:
+        """True if `x` and `u` are still the views of `xu`, i.e., neither has been reassigned."""
+        return _is_fused(self)
+
+    def features(self) -> torch.Tensor:
+        """
+        Concatenated state and control features, (..., n_features + n_controls).
+
+        Returns `xu` if fused, without a copy, otherwise concatenates `x` and `u`.
+        """
+        return _features(self)
+
     def to(self, device: torch.device, non_blocking: bool = False) -> "DynDataImpl":
         """
         Move the state and control tensors to a different device.
@@ -29,6 +92,13 @@ class DynDataImpl:
         Returns:
             DynData: A DynData instance with tensors on the target device.
         """
+        if self.is_fused():
+            nx = self.x.shape[-1]
+            self.xu = self.xu.to(device, non_blocking=non_blocking)
+            self.x, self.u = self.xu[..., :nx], self.xu[..., nx:]
+            self._views = (self.x, self.u)
+            return self
+        self.xu = None
         self.x = self.x.to(device, non_blocking=non_blocking)
         if self.u is not None:
             self.u = self.u.to(device, non_blocking=non_blocking)
@@ -46,6 +116,9 @@ class DynDataImpl:
         Returns:
             DynData: A single DynData instance with stacked state and control tensors.
         """
+        if _can_fuse(batch_list):
+            xu = _fuse_stack([b.x for b in batch_list], [b.u for b in batch_list])
+            return DynDataImpl.fused(xu, batch_list[0].x.shape[-1])
         xs = torch.stack([b.x for b in batch_list], dim=0)
         if batch_list[0].u is not None:
             us = torch.stack([b.u for b in batch_list], dim=0)
@@ -54,6 +127,8 @@ class DynDataImpl:
         return DynDataImpl(xs, us)
 
     def truncate(self, num_step):
+        if self.is_fused():
+            return DynDataImpl.fused(self.xu[:, :num_step, :], self.x.shape[-1])
         return DynDataImpl(self.x[:, :num_step, :],
                            self.u[:, :num_step, :] if self.u is not None else None)
 
@@ -69,6 +144,40 @@ class DynGeoDataImpl:
     """u (torch.Tensor): Control tensor of shape (batch_size, n_steps, n_controls)."""
     edge_index: torch.Tensor
     """edge_index (torch.Tensor): Edge index tensor for graph structure, shape (2, n_edges)."""
+    xu: Union[torch.Tensor, None] = field(default=None, repr=False)
+    """xu (torch.Tensor): Optional fused buffer of shape (batch_size, n_steps, n_features + n_controls).
+    When set, `x` and `u` are views into it, so in-place updates write through."""
+
+    @classmethod
+    def fused(cls, xu: torch.Tensor, n_features: int, edge_index: torch.Tensor) -> "DynGeoDataImpl":
+        """
+        Create a DynGeoData whose state and control tensors are views of `xu`.
+
+        Args:
+            xu (torch.Tensor): Fused buffer of shape (..., n_features + n_controls).
+            n_features (int): Number of state features, i.e., the split point.
+            edge_index (torch.Tensor): Edge index tensor.
+
+        Returns:
+            DynGeoData: A DynGeoData instance backed by `xu`.
+        """
+        return cls(xu[..., :n_features], xu[..., n_features:], edge_index, xu)
+
+    def __post_init__(self):
+        if self.xu is not None:
+            self._views = (self.x, self.u)
+
+    def is_fused(self) -> bool:
+        """True if `x` and `u` are still the views of `xu`, i.e., neither has been reassigned."""
+        return _is_fused(self)
+
+    def features(self) -> torch.Tensor:
+        """
+        Concatenated state and control features, (..., n_features + n_controls).
+
+        Returns `xu` if fused, without a copy, otherwise concatenates `x` and `u`.
+        """
+        return _features(self)
 
     def to(self, device: torch.device, non_blocking: bool = False) -> "DynGeoDataImpl":
         """
@@ -81,9 +190,16 @@ class DynGeoDataImpl:
         Returns:
             DynGeoData: A DynGeoData instance with tensors on the target device.
         """
-        self.x = self.x.to(device, non_blocking=non_blocking)
-        if self.u is not None:
-            self.u = self.u.to(device, non_blocking=non_blocking)
+        if self.is_fused():
+            nx = self.x.shape[-1]
+            self.xu = self.xu.to(device, non_blocking=non_blocking)
+            self.x, self.u = self.xu[..., :nx], self.xu[..., nx:]
+            self._views = (self.x, self.u)
+        else:
+            self.xu = None
+            self.x = self.x.to(device, non_blocking=non_blocking)
+            if self.u is not None:
+                self.u = self.u.to(device, non_blocking=non_blocking)
         self.edge_index = self.edge_index.to(device, non_blocking=non_blocking)
         return self
 
@@ -99,15 +215,20 @@ class DynGeoDataImpl:
         Returns:
             DynGeoData: A single DynGeoData instance with stacked state and control tensors.
         """
+        edge_index = torch.stack([b.edge_index for b in batch_list], dim=0)
+        if _can_fuse(batch_list):
+            xu = _fuse_stack([b.x for b in batch_list], [b.u for b in batch_list])
+            return DynGeoDataImpl.fused(xu, batch_list[0].x.shape[-1], edge_index)
         xs = torch.stack([b.x for b in batch_list], dim=0)
         if batch_list[0].u is not None:
             us = torch.stack([b.u for b in batch_list], dim=0)
         else:
             us = None
-        edge_index = torch.stack([b.edge_index for b in batch_list], dim=0)
         return DynGeoDataImpl(xs, us, edge_index)
 
     def truncate(self, num_step):
+        if self.is_fused():
+            return DynGeoDataImpl.fused(self.xu[:, :num_step, :], self.x.shape[-1], self.edge_index)
         return DynGeoDataImpl(self.x[:, :num_step, :],
                               self.u[:, :num_step, :] if self.u is not None else None,
                               self.edge_index)
@@ -1,7 +1,7 @@
 # Import all models
 from dymad.models.model_base import ModelBase
 from dymad.models.kbf import KBF, GKBF
-from dymad.models.ldm import LDM, GLDM
+from dymad.models.ldm import LDM, GLDM, run_onnx
 from dymad.models.lstm import LSTM
 
 __all__ = [
@@ -10,5 +10,6 @@ __all__ = [
     "GLDM",
     "KBF",
     "LDM",
-    "LSTM"
+    "LSTM",
+    "run_onnx"
 ]
\ No newline at end of file
@@ -111,7 +111,7 @@ class KBF(ModelBase):
         return z_dot
 
     def predict(self, x0: torch.Tensor, w: DynData, ts: Union[np.ndarray, torch.Tensor],
-                method: str = 'dopri5') -> torch.Tensor:
+                method: str = 'dopri5', **kwargs) -> torch.Tensor:
         """Predict trajectory using continuous-time integration.
 
         Args:
@@ -125,6 +125,7 @@ class KBF(ModelBase):
 
             ts: Time points for prediction
             method: ODE solver method (default: 'dopri5')
+            kwargs: Solver settings passed to `predict_continuous`, e.g., `rtol`, `atol`, `step_size`
 
         Returns:
             Predicted trajectory tensor(s):
@@ -132,7 +133,7 @@ class KBF(ModelBase):
                 - Single: (time_steps, n_state_features)
                 - Batch: (time_steps, batch_size, n_state_features)
         """
-        return predict_continuous(self, x0, w.u, ts, method=method, order=self.input_order)
+        return predict_continuous(self, x0, w.u, ts, method=method, order=self.input_order, **kwargs)
 
     def forward(self, w: DynData) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
         """Forward pass for KBF model.
@@ -241,8 +242,8 @@ class GKBF(ModelBase):
 
         return z_dot
 
-    def predict(self, x0: torch.Tensor, w: DynGeoData, ts: Union[np.ndarray, torch.Tensor], method: str = 'dopri5') -> torch.Tensor:
-        return predict_graph_continuous(self, x0, w.u, ts, w.edge_index, method=method, order=self.input_order)
+    def predict(self, x0: torch.Tensor, w: DynGeoData, ts: Union[np.ndarray, torch.Tensor], method: str = 'dopri5', **kwargs) -> torch.Tensor:
+        return predict_graph_continuous(self, x0, w.u, ts, w.edge_index, method=method, order=self.input_order, **kwargs)
 
     def forward(self, w: DynGeoData) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
         z = self.encoder(w)
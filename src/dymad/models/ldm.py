@@ -1,16 +1,80 @@
+import inspect
 import numpy as np
 import torch
 import torch.nn as nn
-from typing import Tuple, Dict, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from dymad.data import DynData, DynGeoData
 from dymad.models import ModelBase
 from dymad.utils import GNN, MLP, predict_continuous, predict_graph_continuous
 
+class _LDMExport(nn.Module):
+    """Tensor-level wrapper of LDM for export, returning (z, z_dot, x_hat)."""
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x: torch.Tensor, u: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        return self.model._raw_forward(x, u)
+
+class _GLDMExport(_LDMExport):
+    """Tensor-level wrapper of GLDM for export, returning (z, z_dot, x_hat)."""
+    def forward(self, x: torch.Tensor, u: torch.Tensor, edge_index: torch.Tensor) \
+            -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        return self.model._raw_forward(x, u, edge_index)
+
+def _export_onnx(model: nn.Module, path: str, args: Tuple, names: List[str], opset_version: int) -> None:
+    """
+    Export encoder, dynamics, and decoder as one ONNX graph, with a dynamic batch axis.
+
+    The TorchScript-based exporter is requested explicitly where torch defaults to the
+    dynamo one, which does not accept `dynamic_axes` for these models.
+    """
+    was_training = model.training
+    model.eval()
+    dynamic_axes = {_n: {0: 'B'} for _n in names if _n != 'edge_index'}
+    dynamic_axes.update({_n: {0: 'B'} for _n in ['z', 'z_dot', 'x_hat']})
+    wrapper = _GLDMExport(model) if model.GRAPH else _LDMExport(model)
+    kwargs = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+    try:
+        with torch.no_grad():
+            torch.onnx.export(wrapper, args, path,
+                              input_names=names,
+                              output_names=['z', 'z_dot', 'x_hat'],
+                              dynamic_axes=dynamic_axes,
+                              opset_version=opset_version,
+                              **kwargs)
+    finally:
+        model.train(was_training)
+
+def run_onnx(sess, x: torch.Tensor, u: torch.Tensor, edge_index: Optional[torch.Tensor] = None) \
+        -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """
+    Run a model exported by `export_onnx` in an onnxruntime session.
+
+    Args:
+        sess (onnxruntime.InferenceSession): Session created from the exported file.
+        x (torch.Tensor): State tensor of shape (batch_size, n_total_state_features).
+        u (torch.Tensor): Control tensor of shape (batch_size, n_total_control_features).
+        edge_index (torch.Tensor, optional): Edge index, for graph models only.
+
+    Returns:
+        Tuple of (latent, latent_derivative, reconstruction)
+    """
+    feeds = {'x': x.detach().cpu().numpy(), 'u': u.detach().cpu().numpy()}
+    if edge_index is not None:
+        feeds['edge_index'] = edge_index.detach().cpu().numpy()
+    return tuple(torch.from_numpy(_o) for _o in sess.run(None, feeds))
+
 class LDM(ModelBase):
     """Latent Dynamics Model (LDM)
 
     The encoder, dynamics, and decoder networks are implemented as MLPs.
+
+    The three networks are not collapsed into one `nn.Sequential`: `forward` returns
+    the latent state `z` as well as `dynamics(z)` and `decoder(z)`, which branch from it,
+    so the composition `decoder(dynamics(encoder(.)))` is never the quantity needed.
+    For lower overhead, see the `compile` and `jit_dynamics` options and `export_onnx`.
     """
     GRAPH = False
 
@@ -67,6 +131,16 @@ class LDM(ModelBase):
             **opts
         )
 
+        # Depth-0 encoder/decoder are parameter-free pass-throughs, bypassed in the calls
+        self._enc_passthrough = enc_depth == 0
+        self._dec_passthrough = dec_depth == 0
+
+        # Reusable [x, u] buffer for gradient-free evaluation, see `encoder`
+        self.register_buffer('_xu_buf', torch.empty(0), persistent=False)
+
+        # Compilation options and solver state
+        self._setup_acceleration(model_config)
+
     def diagnostic_info(self) -> str:
         model_info = super(LDM, self).diagnostic_info()
         model_info += f"Encoder: {self.encoder_net.diagnostic_info()}\n"
@@ -84,8 +158,64 @@ class LDM(ModelBase):
 
         Returns:
             torch.Tensor: Latent representation
+
+        The concatenation of `x` and `u` is avoided, in order of preference, by the
+        pass-through encoder, a fused `w`, the split first layer (`_can_split_encoder`),
+        or the module-owned buffer (`_can_reuse_xu_buf`).
+        """
+        if self._enc_passthrough:
+            return w.features()
+        if self._can_split_encoder(w):
+            return self.encoder_net.forward_cat(w.x, w.u)
+        if self._can_reuse_xu_buf(w):
+            return self.encoder_net(self._features_buffered(w))
+        return self.encoder_net(w.features())
+
+    def export_onnx(self, path: str, batch_size: int = 1, opset_version: int = 17) -> None:
+        """
+        Export encoder, dynamics, and decoder as a single ONNX graph, e.g., for onnxruntime.
+
+        The graph takes inputs `x` and `u` and returns `z`, `z_dot` and `x_hat`;
+        the batch axis is dynamic.  See also `run_onnx`.
+
+        Args:
+            path (str): Output file.
+            batch_size (int): Batch size of the example inputs used for tracing.
+            opset_version (int): ONNX opset.
+        """
+        p = next(self.parameters())
+        x = torch.zeros(batch_size, self.n_total_state_features, dtype=p.dtype, device=p.device)
+        u = torch.zeros(batch_size, self.n_total_control_features, dtype=p.dtype, device=p.device)
+        _export_onnx(self, path, (x, u), ['x', 'u'], opset_version)
+
+    def _can_split_encoder(self, w: DynData) -> bool:
+        """Apply the first encoder layer to `x` and `u` separately: unfused input, eval mode, inference mode."""
+        return not w.is_fused() and not self.training and torch.is_inference_mode_enabled()
+
+    def _can_reuse_xu_buf(self, w: DynData) -> bool:
+        """
+        Concatenate into `_xu_buf`: unfused input, no autograd, and no tracing, compiling or
+        CUDA-graph capture, which would all keep a reference to the overwritten buffer.
+        Inference mode is excluded, as the buffer is a normal tensor.
+        """
+        return not w.is_fused() and not torch.is_grad_enabled() \
+            and not torch.is_inference_mode_enabled() \
+            and not torch.jit.is_tracing() and not torch.compiler.is_compiling() \
+            and not (w.x.is_cuda and torch.cuda.is_current_stream_capturing())
+
+    def _features_buffered(self, w: DynData) -> torch.Tensor:
         """
-        return self.encoder_net(torch.cat([w.x, w.u], dim=-1))
+        Concatenated features written into the module-owned buffer `_xu_buf`,
+        which is reallocated only when the target shape, dtype or device changes.
+
+        The buffer is overwritten by the next call, so the result must not outlive
+        the encoder call; hence it is not used with autograd or the pass-through encoder.
+        """
+        shape = (*w.x.shape[:-1], w.x.shape[-1] + w.u.shape[-1])
+        buf = self._xu_buf
+        if buf.shape != shape or buf.dtype != w.x.dtype or buf.device != w.x.device:
+            self._xu_buf = buf = torch.empty(shape, dtype=w.x.dtype, device=w.x.device)
+        return torch.cat([w.x, w.u], dim=-1, out=buf)
 
     def decoder(self, z: torch.Tensor, w: DynData) -> torch.Tensor:
         """
@@ -97,6 +227,8 @@ class LDM(ModelBase):
         Returns:
             torch.Tensor: Reconstructed state
         """
+        if self._dec_passthrough:
+            return z[..., :self.n_total_state_features]
         return self.decoder_net(z)
 
     def dynamics(self, z: torch.Tensor, w: DynData) -> torch.Tensor:
@@ -121,13 +253,28 @@ class LDM(ModelBase):
         Returns:
             Tuple of (latent, latent_derivative, reconstruction)
         """
+        if self._compiled_forward is not None and not self.training:
+            return self._compiled_forward(w.x, w.u)
+        z = self.encoder(w)
+        z_dot = self.dynamics(z, w)
+        x_hat = self.decoder(z, w)
+        return z, z_dot, x_hat
+
+    def _raw_forward(self, x: torch.Tensor, u: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Forward pass on plain tensors, so that it can be traced by `torch.compile`.
+
+        The concatenation of `x` and `u` is part of the traced graph, so a fused `xu`
+        of the input data is not used on this path.
+        """
+        w = DynData(x, u)
         z = self.encoder(w)
         z_dot = self.dynamics(z, w)
         x_hat = self.decoder(z, w)
         return z, z_dot, x_hat
 
     def predict(self, x0: torch.Tensor, w: DynData, ts: Union[np.ndarray, torch.Tensor],
-                method: str = 'dopri5') -> torch.Tensor:
+                method: str = 'dopri5', **kwargs) -> torch.Tensor:
         """
         Predict trajectory using continuous-time integration.
 
@@ -144,8 +291,10 @@ class LDM(ModelBase):
 
                 For autonomous systems, use zero-valued controls
 
-            ts (Union[np.ndarray, torch.Tensor]): Time points for prediction
-            method (str): ODE solver method
+            ts (Union[np.ndarray, torch.Tensor]): Time points for prediction, converted once
+                to a tensor on the device and in the dtype of `x0`
+            method (str): ODE solver method; 'rk4' is a fixed-step fast path without error control
+            kwargs: Solver settings passed to `predict_continuous`, e.g., `rtol`, `atol`, `step_size`
 
         Returns:
             torch.Tensor: Predicted trajectory tensor(s):
@@ -153,7 +302,9 @@ class LDM(ModelBase):
                 - Single: (time_steps, n_total_state_features)
                 - Batch: (time_steps, batch_size, n_total_state_features)
         """
-        return predict_continuous(self, x0, w.u, ts, method=method, order=self.input_order)
+        ts = torch.as_tensor(ts, dtype=x0.dtype, device=x0.device)
+        return predict_continuous(self, x0, w.u, ts, method=method, order=self.input_order,
+                                  solver_cache=self._solver_cache, **kwargs)
 
 class GLDM(ModelBase):
     """Graph Latent Dynamics Model (GLDM).
@@ -199,13 +350,7 @@ class GLDM(ModelBase):
         })
 
         # Build network components
-        self.encoder_net = GNN(
-            input_dim=self.n_total_features // self.n_nodes,
-            latent_dim=self.latent_dimension,
-            output_dim=enc_out_dim,
-            n_layers=enc_depth,
-            **opts_gnn
-        )
+        self.encoder_net = self._build_gnn(self.n_total_features // self.n_nodes, enc_out_dim, enc_depth, opts_gnn)
 
         self.dynamics_net = MLP(
             input_dim  = enc_out_dim * self.n_nodes,
@@ -215,12 +360,19 @@ class GLDM(ModelBase):
             **opts_mlp
         )
 
-        self.decoder_net = GNN(
-            input_dim=dec_inp_dim,
+        self.decoder_net = self._build_gnn(dec_inp_dim, self.n_total_state_features // self.n_nodes, dec_depth, opts_gnn)
+
+        # Compilation options and solver state
+        self._setup_acceleration(model_config)
+
+    def _build_gnn(self, input_dim: int, output_dim: int, n_layers: int, opts: dict) -> GNN:
+        """Build an encoder or decoder GNN with the options shared by both."""
+        return GNN(
+            input_dim=input_dim,
             latent_dim=self.latent_dimension,
-            output_dim=self.n_total_state_features // self.n_nodes,
-            n_layers=dec_depth,
-            **opts_gnn
+            output_dim=output_dim,
+            n_layers=n_layers,
+            **opts
         )
 
     def diagnostic_info(self) -> str:
@@ -232,7 +384,25 @@ class GLDM(ModelBase):
         return model_info
 
     def encoder(self, w: DynGeoData) -> torch.Tensor:
-        return self.encoder_net(torch.cat([w.x, w.u], dim=-1), w.edge_index)
+        return self.encoder_net(w.features(), w.edge_index)
+
+    def export_onnx(self, path: str, edge_index: torch.Tensor, batch_size: int = 1, opset_version: int = 17) -> None:
+        """
+        Export encoder, dynamics, and decoder as a single ONNX graph, e.g., for onnxruntime.
+
+        The graph takes inputs `x`, `u` and `edge_index`, and returns `z`, `z_dot` and `x_hat`;
+        the batch axis of `x` and `u` is dynamic.  See also `run_onnx`.
+
+        Args:
+            path (str): Output file.
+            edge_index (torch.Tensor): Example edge index, of shape (1, 2, n_edges).
+            batch_size (int): Batch size of the example inputs used for tracing.
+            opset_version (int): ONNX opset.
+        """
+        p = next(self.parameters())
+        x = torch.zeros(batch_size, self.n_total_state_features, dtype=p.dtype, device=p.device)
+        u = torch.zeros(batch_size, self.n_total_control_features, dtype=p.dtype, device=p.device)
+        _export_onnx(self, path, (x, u, edge_index.to(p.device)), ['x', 'u', 'edge_index'], opset_version)
 
     def decoder(self, z: torch.Tensor, w: DynGeoData) -> torch.Tensor:
         return self.decoder_net(z, w.edge_index)
@@ -241,10 +411,22 @@ class GLDM(ModelBase):
         return self.dynamics_net(z)
 
     def forward(self, w: DynGeoData) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        if self._compiled_forward is not None and not self.training:
+            return self._compiled_forward(w.x, w.u, w.edge_index)
+        z = self.encoder(w)
+        z_dot = self.dynamics(z, w)
+        x_hat = self.decoder(z, w)
+        return z, z_dot, x_hat
+
+    def _raw_forward(self, x: torch.Tensor, u: torch.Tensor, edge_index: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        w = DynGeoData(x, u, edge_index)
         z = self.encoder(w)
         z_dot = self.dynamics(z, w)
         x_hat = self.decoder(z, w)
         return z, z_dot, x_hat
 
-    def predict(self, x0: torch.Tensor, w: DynGeoData, ts: Union[np.ndarray, torch.Tensor], method: str = 'dopri5') -> torch.Tensor:
-        return predict_graph_continuous(self, x0, w.u, ts, w.edge_index, method=method, order=self.input_order)
+    def predict(self, x0: torch.Tensor, w: DynGeoData, ts: Union[np.ndarray, torch.Tensor], method: str = 'dopri5', **kwargs) -> torch.Tensor:
+        """Predict trajectory using continuous-time integration; see `LDM.predict`.  `cuda_graph` is not supported."""
+        ts = torch.as_tensor(ts, dtype=x0.dtype, device=x0.device)
+        return predict_graph_continuous(self, x0, w.u, ts, w.edge_index, method=method, order=self.input_order,
+                                        solver_cache=self._solver_cache, **kwargs)
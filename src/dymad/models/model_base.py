@@ -1,12 +1,28 @@
 from abc import ABC, abstractmethod
+import copy
 import torch
 import torch.nn as nn
-from typing import Tuple, Union
+from typing import Dict, Tuple, Union
 
 from dymad.data import DynData, DynGeoData
 
 Data = Union[DynData, DynGeoData]
 
+def _cast_io(net: nn.Module, dtype: torch.dtype) -> None:
+    """
+    Register hooks that cast floating-point inputs of `net` to `dtype`,
+    and cast the output back to the dtype of the original input.
+    """
+    def _pre(m, args):
+        m._io_dtype = next((a.dtype for a in args if torch.is_tensor(a) and a.is_floating_point()), None)
+        return tuple(a.to(dtype) if torch.is_tensor(a) and a.is_floating_point() else a for a in args)
+
+    def _post(m, args, out):
+        return out.to(m._io_dtype) if m._io_dtype is not None else out
+
+    net.register_forward_pre_hook(_pre)
+    net.register_forward_hook(_post)
+
 class ModelBase(nn.Module, ABC):
     r"""
     Base class for dynamic models.
@@ -41,6 +57,74 @@ class ModelBase(nn.Module, ABC):
         """
         return f"Model parameters: {sum(p.numel() for p in self.parameters())}\n"
 
+    def _setup_acceleration(self, model_config: Dict) -> None:
+        """
+        Set up the options shared by the continuous-time models, after the networks are built.
+
+        - `jit_dynamics`: compile the dynamics network, see `MLP.jit`.
+        - `compile`: compile the tensor-level `_raw_forward`, see `forward`.
+        - The solver cache, persisted across `predict` calls.
+
+        Args:
+            model_config (Dict): Model configuration.
+        """
+        # Optionally compile the dynamics network, the hottest call in the ODE RHS
+        if model_config.get('jit_dynamics', False):
+            self.dynamics_net.jit()
+
+        # Solver state persisted across predict calls
+        self._solver_cache = {}
+
+        # Optionally compile the tensor-level forward pass, used by `forward` in eval mode only;
+        # `predict` calls the encoder and dynamics directly and is not affected.
+        # `compile: true` uses the default mode, a string selects the mode.  With "reduce-overhead"
+        # the outputs live in CUDA-graph memory, overwritten by the next call; clone them if kept.
+        self._compiled_forward = None
+        _mode = model_config.get('compile', False)
+        if _mode:
+            self._compiled_forward = torch.compile(self._raw_forward, dynamic=False,
+                                                   mode=_mode if isinstance(_mode, str) else None)
+
+    def to_inference(self, dtype: torch.dtype = torch.bfloat16) -> "ModelBase":
+        """
+        Return an inference-only copy of the model with reduced-precision networks.
+
+        The original model is left untouched, so it can still be trained.
+
+        Args:
+            dtype (torch.dtype): Target precision.
+
+                - torch.bfloat16 or torch.float16: the encoder, dynamics, and decoder networks
+                  are cast to `dtype`.  Their inputs are cast on entry and outputs are cast
+                  back, so the ODE state and solver stay in the original precision.
+                - torch.qint8: dynamic int8 quantization of all `nn.Linear` layers (CPU only).
+
+        Returns:
+            ModelBase: The inference copy, in eval mode.
+        """
+        # The compiled forward and the solver cache (e.g., captured CUDA graphs) are tied
+        # to the original parameters and cannot be copied; the copy starts without them.
+        memo = {}
+        _compiled = getattr(self, '_compiled_forward', None)
+        if _compiled is not None:
+            memo[id(_compiled)] = None
+        _cache = getattr(self, '_solver_cache', None)
+        if _cache is not None:
+            memo[id(_cache)] = {}
+        model = copy.deepcopy(self, memo)
+
+        if dtype == torch.qint8:
+            torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8, inplace=True)
+            return model.eval()
+
+        model.eval()
+
+        for name in ('encoder_net', 'dynamics_net', 'decoder_net'):
+            net = getattr(model, name, None)
+            if net is not None:
+                _cast_io(net.to(dtype), dtype)
+        return model
+
     @abstractmethod
     def encoder(self, w: Data) -> torch.Tensor:
         raise NotImplementedError("This is the base class.")
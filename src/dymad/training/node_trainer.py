@@ -59,8 +59,9 @@ class NODETrainer(TrainerBase):
 
         # ODE solver settings from config
         self.ode_method = self.config['training'].get('ode_method', 'dopri5')
-        self.rtol = self.config['training'].get('rtol', 1e-7)
-        self.atol = self.config['training'].get('atol', 1e-9)
+        # YAML reads exponents without a decimal point, e.g. 1e-7, as strings
+        self.rtol = float(self.config['training'].get('rtol', 1e-7))
+        self.atol = float(self.config['training'].get('atol', 1e-9))
 
         self.recon_weight = self.config['training'].get('reconstruction_weight', 1.0)
         self.dynamics_weight = self.config['training'].get('dynamics_weight', 1.0)
@@ -84,7 +85,7 @@ class NODETrainer(TrainerBase):
         # Use the actual time points from trajectory manager
         ts = self.t[:num_steps].to(self.device)
         # Use native batch prediction
-        predictions = self.model.predict(init_states, B, ts, method=self.ode_method)
+        predictions = self.model.predict(init_states, B, ts, method=self.ode_method, rtol=self.rtol, atol=self.atol)
         # predictions shape: (time_steps, batch_size, n_total_state_features)
         # We need: (batch_size, time_steps, n_total_state_features)
         predictions = predictions.permute(1, 0, 2)
@@ -116,7 +116,7 @@ def load_model(model_class, checkpoint_path, config_path, config_mod=None):
                 _u = torch.tensor(_u, dtype=dtype, device=device)
             else:
                 _u = _u.clone().detach().to(device)
-            with torch.no_grad():
+            with torch.inference_mode():
                 pred = model.predict(_x0, DynGeoData(None, _u, ei), t).cpu().numpy()
             return _data_transform_x.inverse_transform([pred])[0]
     else:
@@ -129,7 +129,7 @@ def load_model(model_class, checkpoint_path, config_path, config_mod=None):
                 _u = torch.tensor(_u, dtype=dtype, device=device)
             else:
                 _u = _u.clone().detach().to(device)
-            with torch.no_grad():
+            with torch.inference_mode():
                 pred = model.predict(_x0, DynData(None, _u), t).cpu().numpy()
             return _data_transform_x.inverse_transform([pred])[0]
 
@@ -1,6 +1,7 @@
-from scipy.interpolate import interp1d
+from scipy.interpolate import CubicSpline, interp1d
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 try:
     from torch_geometric.nn.conv import MessagePassing
     from torch_geometric.nn import ChebConv, SAGEConv
@@ -218,6 +219,13 @@ class MLP(nn.Module):
         # Initialise weights & biases
         self.apply(self._init_linear)
 
+        # Flat layer list for inference, refreshed in `train`
+        self._inf_layers = self._inference_layers()
+
+        # Compiled forward pass, set by `jit` and refreshed in `train`
+        self._jit = False
+        self._jit_forward = None
+
     def diagnostic_info(self) -> str:
         return f"Weight init: {self._weight_init}, " + \
                f"Weight gain: {self._gain}, " + \
@@ -228,8 +236,70 @@ class MLP(nn.Module):
             self._weight_init(m.weight, self._gain)
             self._bias_init(m.bias)
 
+    def _inference_layers(self) -> tuple:
+        """
+        Layers of `self.net` with the no-op `nn.Identity` modules dropped.
+
+        Kept as a plain tuple, so the layers are not registered twice in the state dict.
+        """
+        layers = self.net if isinstance(self.net, nn.Sequential) else (self.net,)
+        return tuple(m for m in layers if not isinstance(m, nn.Identity))
+
+    def forward_cat(self, *parts: torch.Tensor) -> torch.Tensor:
+        """
+        Inference forward pass on the concatenation of `parts` along the last axis,
+        without materializing the concatenated tensor.
+
+        The first Linear layer is split column-wise, `[x, u] @ W.T = x @ W_x.T + u @ W_u.T`.
+        Falls back to `forward` if the first layer is not a plain `nn.Linear`.
+        """
+        first = self._inf_layers[0] if self._inf_layers else None
+        if self.training or type(first) is not nn.Linear:
+            return self.forward(torch.cat(parts, dim=-1))
+        dtype, i, out = parts[0].dtype, 0, None
+        for p in parts:
+            n = p.shape[-1]
+            y = F.linear(p.to(first.weight.dtype), first.weight[:, i:i+n])
+            out = y if out is None else out + y
+            i += n
+        if first.bias is not None:
+            out = out + first.bias
+        for layer in self._inf_layers[1:]:
+            out = layer(out)
+        return out.to(dtype)
+
+    def jit(self) -> "MLP":
+        """
+        Compile the forward pass with `torch.compile(fullgraph=True)`, fusing the linear and
+        activation kernels.  Compilation happens on the first call.
+
+        The modules are untouched, so the state dict is unchanged.  The compiled function is
+        rebuilt in `train`, so that copies, e.g., by `ModelBase.to_inference`, compile their own layers.
+        """
+        self._jit = True
+        self._jit_forward = torch.compile(self._forward, fullgraph=True)
+        return self
+
+    def train(self, mode: bool = True) -> "MLP":
+        super().train(mode)
+        if not mode:
+            # Layers may have been swapped since construction, e.g., by quantization
+            self._inf_layers = self._inference_layers()
+        if self._jit:
+            self._jit_forward = torch.compile(self._forward, fullgraph=True)
+        return self
+
     def forward(self, x: torch.Tensor) -> torch.Tensor:
-        return self.net(x)
+        if self._jit_forward is not None:
+            return self._jit_forward(x)
+        return self._forward(x)
+
+    def _forward(self, x: torch.Tensor) -> torch.Tensor:
+        if self.training:
+            return self.net(x)
+        for layer in self._inf_layers:
+            x = layer(x)
+        return x
 
 class GNN(nn.Module):
     """
@@ -309,24 +379,69 @@ class GNN(nn.Module):
 
     def forward(self, x, edge_index, **kwargs):
         """
-        The main bottleneck is that batch operation is only applicable to the same edge_index.
-
-        If edge_index is 2D, we can process the entire batch in one go.
+        If edge_index is 2D, or has a batch size of 1, the same graph is shared by the
+        entire batch and we can process it in one go.
 
         The input is reshaped to (N, n_nodes, n_features) where N is the batch size,
         before passing through the GNN layers.
 
+        Otherwise, the graphs of the batch are merged into one disjoint graph with
+        B*n_nodes nodes, so the batch is still processed in a single pass.
+
         The output is reshaped back to (N, n_nodes * n_features).
         """
+        if edge_index.ndim == 2:
+            return self._forward_single(x, edge_index, **kwargs)
         if edge_index.shape[0] == 1:
             return self._forward_single(x, edge_index[0], **kwargs)
-        else:
-            assert len(x) == len(edge_index), \
-                "Batch size of x and edge_index must match. Got {} and {}.".format(x.shape, edge_index.shape)
-            tmp = []
-            for _x, _e in zip(x, edge_index):
-                tmp.append(self._forward_single(_x, _e, **kwargs))
-            return torch.stack(tmp, dim=0)
+        assert len(x) == len(edge_index), \
+            "Batch size of x and edge_index must match. Got {} and {}.".format(x.shape, edge_index.shape)
+        return self._forward_batch(x, edge_index, **kwargs)
+
+    def _forward_batch(self, x, edge_index, **kwargs):
+        """
+        Forward pass for a batch of different edge_index, of shape (B, 2, n_edges).
+
+        x should be of shape (B, ..., n_nodes*input_features).  The B graphs are
+        merged into a block-diagonal graph by offsetting node indices, and the
+        batch axis is folded into the node axis, (..., B*n_nodes, input_features).
+        """
+        B = x.shape[0]
+        lead = x.shape[1:-1]
+        feature_dim = x.shape[-1] // self.n_nodes
+        ei = self._merge_edge_index(edge_index)
+
+        h = x.reshape(B, -1, self.n_nodes, feature_dim).transpose(0, 1)
+        h = h.reshape(-1, B * self.n_nodes, feature_dim)
+        for layer in self.layers:
+            if isinstance(layer, MessagePassing):
+                h = layer(h, ei, **kwargs)
+            else:
+                h = layer(h)
+        h = h.reshape(-1, B, self.n_nodes, h.shape[-1]).transpose(0, 1)
+        return h.reshape(B, *lead, -1)
+
+    def _merge_edge_index(self, edge_index):
+        """
+        Block-diagonal edge_index, of shape (2, B*n_edges), for a batch of graphs.
+
+        The ODE solver passes the same edge_index at every RHS evaluation, so the last
+        result is memoized on the identity and version of the input tensor.  Inference
+        tensors do not track versions, so in-place updates cannot be detected; they are
+        not memoized.
+        """
+        memoize = not edge_index.is_inference()
+        if memoize:
+            key = (edge_index, edge_index._version)
+            cache = getattr(self, '_ei_cache', None)
+            if cache is not None and cache[0][0] is key[0] and cache[0][1] == key[1]:
+                return cache[1]
+        B = edge_index.shape[0]
+        offset = torch.arange(B, device=edge_index.device).view(B, 1, 1) * self.n_nodes
+        ei = (edge_index + offset).permute(1, 0, 2).reshape(2, -1)
+        if memoize:
+            self._ei_cache = (key, ei)
+        return ei
 
     def _forward_single(self, x, edge_index, **kwargs):
         """
@@ -376,6 +491,17 @@ class ControlInterpolator(nn.Module):
             self._interp = self._interp_0
         elif self.order == 'linear':
             self._interp = self._interp_1
+        elif self.order == 'cubic':
+            # Not-a-knot cubic spline, identical to scipy's interp1d(kind='cubic').
+            # The coefficients are computed once, shape (4, N-1, ..., m), and evaluated in Torch,
+            # so the ODE right-hand side never leaves the device.
+            _spl = CubicSpline(t.detach().cpu().numpy(),
+                               u.detach().cpu().numpy(),
+                               axis=-2,
+                               bc_type='not-a-knot',
+                               extrapolate=True)
+            self.register_buffer('c', torch.as_tensor(_spl.c, dtype=u.dtype, device=u.device))
+            self._interp = self._interp_3
         else:
             # Assuming option for 'scipy' interpolation
             self._cpu_t  = t.detach().cpu().numpy()
@@ -402,6 +528,12 @@ class ControlInterpolator(nn.Module):
         w        = (t_query - t0) / (t1 - t0)
         return (1. - w) * u0 + w * u1
 
+    def _interp_3(self, t_query: torch.Tensor) -> torch.Tensor:
+        idx = (torch.searchsorted(self.t, t_query, right=True) - 1).clamp(0, self.t.numel()-2)
+        dt  = t_query - self.t[idx]
+        c   = self.c[:, idx]
+        return ((c[0] * dt + c[1]) * dt + c[2]) * dt + c[3]
+
     def _interp_s(self, t_query: torch.Tensor) -> torch.Tensor:
         uq = self._spl(t_query.detach().cpu().numpy())
         return torch.as_tensor(uq,
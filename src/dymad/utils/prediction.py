@@ -3,13 +3,107 @@ import numpy as np
 import scipy.interpolate as sp_inter
 import torch
 from torchdiffeq import odeint
-from typing import Union
+from typing import Dict, Optional, Union
 
 from dymad.data import DynData, DynGeoData
 from dymad.utils import ControlInterpolator
 
 logger = logging.getLogger(__name__)
 
+# Order of the adaptive solvers in torchdiffeq, used for the initial step size
+_ADAPTIVE_ORDER = {
+    'dopri8'        : 7,
+    'dopri5'        : 4,
+    'bosh3'         : 2,
+    'fehlberg2'     : 1,
+    'adaptive_heun' : 1,
+}
+
+def _initial_step(func, t0, y0, order, rtol=1e-7, atol=1e-9) -> float:
+    """
+    Initial step size of an adaptive solver, following Hairer et al., Sec. II.4,
+    which is also the heuristic used by torchdiffeq.
+    """
+    _norm = lambda v: v.pow(2).mean().sqrt().item()
+    scale = atol + y0.abs() * rtol
+    f0 = func(t0, y0)
+    d0, d1 = _norm(y0 / scale), _norm(f0 / scale)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    f1 = func(t0 + h0, y0 + h0 * f0)
+    d2 = _norm((f1 - f0) / scale) / h0
+    if d1 <= 1e-15 and d2 <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1. / (order + 1))
+    return min(100 * h0, h1)
+
+def _solver_options(solver_cache, func, ts, z0, method, rtol, atol, step_size=None):
+    """
+    Solver options for `odeint`, reusing the initial step size cached in `solver_cache`.
+
+    The cache is keyed on the shape, dtype and device of the state, the solver method and
+    the tolerances, so it is invalidated whenever any of them changes.
+
+    Fixed-step methods, e.g. 'rk4', skip error estimation and step adaptation entirely;
+    they step on the grid of `ts`, refined by `step_size` if given.
+    """
+    if method not in _ADAPTIVE_ORDER:
+        return None if step_size is None else {'step_size': step_size}
+    if solver_cache is None:
+        return None
+    key = (tuple(z0.shape), z0.dtype, z0.device, method, rtol, atol)
+    if key not in solver_cache:
+        with torch.no_grad():
+            solver_cache[key] = _initial_step(func, ts[0], z0.detach(), _ADAPTIVE_ORDER[method], rtol, atol)
+        logger.debug(f"_solver_options: Cached initial step {solver_cache[key]} for {key}")
+    return {'first_step': solver_cache[key]}
+
+class _CUDAGraphRHS:
+    """
+    ODE right-hand side `rhs(z, u)` replayed from a captured CUDA graph.
+
+    The graph is captured once on static input tensors; each call copies the state and
+    control into them and replays the graph, removing the per-kernel launch overhead
+    of every solver stage.  Only valid without autograd, and for fixed shapes.
+    """
+    def __init__(self, rhs, z0: torch.Tensor, u0: torch.Tensor, n_warmup: int = 3):
+        self._z = z0.detach().clone()
+        self._u = u0.detach().clone()
+
+        # Warm up on a side stream, as required before capture
+        s = torch.cuda.Stream()
+        s.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(s):
+            for _ in range(n_warmup):
+                rhs(self._z, self._u)
+        torch.cuda.current_stream().wait_stream(s)
+
+        self._graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(self._graph):
+            self._out = rhs(self._z, self._u)
+
+    def __call__(self, z: torch.Tensor, u: torch.Tensor) -> torch.Tensor:
+        self._z.copy_(z)
+        self._u.copy_(u)
+        self._graph.replay()
+        # The solver keeps the stage derivatives, so the static output is copied out
+        return self._out.clone()
+
+def _cuda_graph_rhs(solver_cache, model, rhs, z0, u0):
+    """
+    Capture `rhs` as a CUDA graph, reusing the one cached in `solver_cache` for the same
+    shapes and mode, e.g., across the repeated predict calls of model predictive control.
+    The graph reads the parameters at their captured addresses, so it follows in-place weight
+    updates; the addresses are part of the key, so moved or reallocated parameters recapture.
+    """
+    key = ('cuda_graph', tuple(z0.shape), tuple(u0.shape), z0.dtype, z0.device,
+           model.training, torch.is_inference_mode_enabled(),
+           tuple(p.data_ptr() for p in model.parameters()))
+    if key not in solver_cache:
+        solver_cache[key] = _CUDAGraphRHS(rhs, z0, u0)
+        logger.debug(f"_cuda_graph_rhs: Captured RHS for {key}")
+    return solver_cache[key]
+
 def predict_continuous(
     model,
     x0: torch.Tensor,
@@ -17,6 +111,7 @@ def predict_continuous(
     ts: Union[np.ndarray, torch.Tensor],
     method: str = 'dopri5',
     order: str = 'cubic',
+    solver_cache: Optional[Dict] = None,
     **kwargs
 ) -> torch.Tensor:
     """
@@ -36,9 +131,19 @@ def predict_continuous(
 
             For autonomous systems, use zero-valued controls
 
-        ts: Time points (n_steps,)
-        method: ODE solver method
+        ts: Time points (n_steps,).  Converted once, before integration, to a tensor with
+            the dtype and device of `x0`; the ODE right-hand side never sees a Numpy array.
+            Callers in a loop should pass such a tensor to avoid repeated host-device copies.
+        method: ODE solver method.  Adaptive, e.g. 'dopri5', or fixed-step, e.g. 'rk4',
+            which is cheaper when the latent dynamics are smooth and tolerances are loose
         order: Interpolation method for control inputs ('zoh', 'linear' or 'cubic')
+        solver_cache: Optional dictionary persisting solver state, e.g., the initial step size,
+            across calls.  Typically owned by the model.
+        kwargs: Solver settings, `rtol` and `atol` for adaptive methods (default 1e-7 and 1e-9),
+            and `step_size` for fixed-step methods (default: the grid of `ts`)
+            `cuda_graph=True` replays the right-hand side from a CUDA graph, captured once per
+            shape and cached in `solver_cache`; requires a CUDA device, no autograd and a
+            `solver_cache`, and is ignored otherwise
 
     Returns:
         np.ndarray:
@@ -64,11 +169,8 @@ def predict_continuous(
         _x0 = x0.clone().detach().to(device).unsqueeze(0)
         _us = us.clone().detach().to(device).unsqueeze(0)
 
-    # Convert ts to tensor
-    if isinstance(ts, np.ndarray):
-        ts = torch.from_numpy(ts).float().to(device)
-    else:
-        ts = ts.float().to(device)
+    # Convert ts to tensor; a no-op if the caller already did so
+    ts = torch.as_tensor(ts, dtype=x0.dtype, device=device)
 
     n_steps = len(ts)
     if _us.shape[1] != n_steps:
@@ -80,16 +182,28 @@ def predict_continuous(
     u0 = _us[:, 0, :]
     z0 = model.encoder(DynData(_x0, u0))
 
+    # The right-hand side only needs the latent derivative, so the reconstruction
+    # computed by model.forward is skipped; it would be discarded at every stage.
     interp = ControlInterpolator(ts, _us, order=order)
-    def ode_func(t, z):
+    def rhs(z, u):
         x = model.decoder(z, None)
-        u = interp(t)
-        _, z_dot, _ = model(DynData(x, u))
-        return z_dot
+        w = DynData(x, u)
+        return model.dynamics(model.encoder(w), w)
+
+    if kwargs.get('cuda_graph', False):
+        if solver_cache is not None and z0.is_cuda and not torch.is_grad_enabled():
+            rhs = _cuda_graph_rhs(solver_cache, model, rhs, z0, u0)
+        else:
+            logger.warning("predict_continuous: cuda_graph ignored, it requires a solver_cache, a CUDA device and no autograd")
+
+    def ode_func(t, z):
+        return rhs(z, interp(t))
 
     # Integrate
     logger.debug(f"predict_continuous: Starting ODE integration with shape {z0.shape}, method {method}, and interpolation order {order}")
-    z_traj = odeint(ode_func, z0, ts, method=method)
+    rtol, atol = kwargs.get('rtol', 1e-7), kwargs.get('atol', 1e-9)
+    options = _solver_options(solver_cache, ode_func, ts, z0, method, rtol, atol, kwargs.get('step_size', None))
+    z_traj = odeint(ode_func, z0, ts, method=method, rtol=rtol, atol=atol, options=options)
     logger.debug(f"predict_continuous: Completed integration, trajectory shape: {z_traj.shape}")
 
     x_traj = model.decoder(z_traj.view(-1, z_traj.shape[-1]), None).view(n_steps, z_traj.shape[1], -1)
@@ -107,6 +221,7 @@ def predict_graph_continuous(
     edge_index: torch.Tensor,
     method: str = 'dopri5',
     order: str = 'cubic',
+    solver_cache: Optional[Dict] = None,
     **kwargs
 ) -> torch.Tensor:
     """
@@ -126,9 +241,17 @@ def predict_graph_continuous(
 
             For autonomous systems, use zero-valued controls
 
-        ts: Time points (n_steps,)
-        method: ODE solver method
+        ts: Time points (n_steps,).  Converted once, before integration, to a tensor with
+            the dtype and device of `x0`; the ODE right-hand side never sees a Numpy array.
+            Callers in a loop should pass such a tensor to avoid repeated host-device copies.
+        method: ODE solver method.  Adaptive, e.g. 'dopri5', or fixed-step, e.g. 'rk4',
+            which is cheaper when the latent dynamics are smooth and tolerances are loose
         order: Interpolation method for control inputs ('zoh', 'linear' or 'cubic')
+        solver_cache: Optional dictionary persisting solver state, e.g., the initial step size,
+            across calls.  Typically owned by the model.
+        kwargs: Solver settings, `rtol` and `atol` for adaptive methods (default 1e-7 and 1e-9),
+            and `step_size` for fixed-step methods (default: the grid of `ts`)
+            `cuda_graph` is not supported for graph models and is ignored with a warning
 
     Returns:
         np.ndarray:
@@ -161,11 +284,8 @@ def predict_graph_continuous(
     else:
         raise ValueError(f"edge_index must be 2D or 3D tensor. Got {edge_index.shape}")
 
-    # Convert ts to tensor
-    if isinstance(ts, np.ndarray):
-        ts = torch.from_numpy(ts).float().to(device)
-    else:
-        ts = ts.float().to(device)
+    # Convert ts to tensor; a no-op if the caller already did so
+    ts = torch.as_tensor(ts, dtype=x0.dtype, device=device)
 
     n_steps = len(ts)
     if _us.shape[1] != n_steps:
@@ -181,18 +301,26 @@ def predict_graph_continuous(
     _data  = DynGeoData(None, None, _ei)
     def ode_func(t, z):
         x = model.decoder(z, _data)
-        u = interp(t)
-        _, z_dot, _ = model(DynGeoData(x, u, _ei))
-        return z_dot
+        w = DynGeoData(x, interp(t), _ei)
+        return model.dynamics(model.encoder(w), w)
+
+    if kwargs.get('cuda_graph', False):
+        logger.warning("predict_graph_continuous: cuda_graph ignored, it is not supported for graph models")
 
     # Integrate
     logger.debug(f"predict_continuous: Starting ODE integration with shape {z0.shape}, method {method}, and interpolation order {order}")
-    z_traj = odeint(ode_func, z0, ts, method=method)
+    rtol, atol = kwargs.get('rtol', 1e-7), kwargs.get('atol', 1e-9)
+    options = _solver_options(solver_cache, ode_func, ts, z0, method, rtol, atol, kwargs.get('step_size', None))
+    z_traj = odeint(ode_func, z0, ts, method=method, rtol=rtol, atol=atol, options=options)
     logger.debug(f"predict_continuous: Completed integration, trajectory shape: {z_traj.shape}")
 
-    # x_traj = model.decoder(z_traj.view(-1, z_traj.shape[-1]), _data).view(n_steps, z_traj.shape[1], -1)
-    tmp = z_traj.permute(1, 0, 2)  # (batch_size, n_steps, n_features)
-    x_traj = model.decoder(tmp, _data).permute(1, 0, 2)
+    if _ei.shape[0] == 1:
+        # Shared graph: the GNN accepts any leading dimensions, so decode in place
+        # and avoid copying the permuted trajectory
+        x_traj = model.decoder(z_traj, _data)
+    else:
+        tmp = z_traj.permute(1, 0, 2)  # (batch_size, n_steps, n_features)
+        x_traj = model.decoder(tmp, _data).permute(1, 0, 2)
 
     if not is_batch:
         x_traj = x_traj.squeeze(1)
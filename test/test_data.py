@@ -0,0 +1,67 @@
+import torch
+
+from dymad.data import DynData, DynGeoData
+
+def check_data(out, ref, label=''):
+    assert out.shape == ref.shape, f"{label} failed: shape {out.shape} != {ref.shape}"
+    assert out.dtype == ref.dtype, f"{label} failed: dtype {out.dtype} != {ref.dtype}"
+    assert torch.equal(out, ref), f"{label} failed: {out} != {ref}"
+
+torch.manual_seed(0)
+B, T = 3, 5
+n_x, n_u = 2, 1
+xs = [torch.randn(T, n_x) for _ in range(B)]
+us = [torch.randn(T, n_u) for _ in range(B)]
+ei = torch.tensor([[0, 1], [1, 0]])
+
+for cls, args in [(DynData, ()), (DynGeoData, (ei,))]:
+    name = cls.__name__
+
+    # Collate matches the stacked tensors, and is backed by one buffer
+    w = cls.collate([cls(_x, _u, *args) for _x, _u in zip(xs, us)])
+    assert w.is_fused(), f"{name} collate: not fused"
+    check_data(w.x, torch.stack(xs), label=f'{name} collate x')
+    check_data(w.u, torch.stack(us), label=f'{name} collate u')
+    check_data(w.features(), torch.cat([torch.stack(xs), torch.stack(us)], dim=-1), label=f'{name} features')
+    if args:
+        check_data(w.edge_index, torch.stack([ei]*B), label=f'{name} collate edge_index')
+
+    # In-place writes through the views show up in the buffer
+    w.x[0, 0, 0] = 10.
+    w.u[1, 2, 0] = 20.
+    assert w.xu[0, 0, 0] == 10. and w.xu[1, 2, n_x] == 20., f"{name} write-through failed"
+
+    # to() and truncate() keep the views
+    v = w.to('cpu')
+    assert v.is_fused(), f"{name} to: not fused"
+    v.x[0, 1, 0] = 30.
+    assert v.xu[0, 1, 0] == 30., f"{name} to: write-through failed"
+    v = w.truncate(2)
+    assert v.is_fused(), f"{name} truncate: not fused"
+    check_data(v.x, w.x[:, :2], label=f'{name} truncate x')
+    check_data(v.u, w.u[:, :2], label=f'{name} truncate u')
+    v.u[0, 0, 0] = 40.
+    assert v.xu[0, 0, n_x] == 40., f"{name} truncate: write-through failed"
+
+    # Reassigning either half breaks the fusion
+    v = cls.collate([cls(_x, _u, *args) for _x, _u in zip(xs, us)])
+    v.x = v.x + 1.
+    assert not v.is_fused(), f"{name} reassigned x: still fused"
+    check_data(v.features(), torch.cat([torch.stack(xs)+1., torch.stack(us)], dim=-1), label=f'{name} reassigned x')
+    v = cls.collate([cls(_x, _u, *args) for _x, _u in zip(xs, us)])
+    v.u = v.u * 2.
+    assert not v.is_fused(), f"{name} reassigned u: still fused"
+    check_data(v.features(), torch.cat([torch.stack(xs), torch.stack(us)*2.], dim=-1), label=f'{name} reassigned u')
+
+    # Controls of a different dtype fall back to separate stacks, keeping u
+    us64 = [_u.double() for _u in us]
+    w = cls.collate([cls(_x, _u, *args) for _x, _u in zip(xs, us64)])
+    assert not w.is_fused() and w.xu is None, f"{name} dtype fallback: fused"
+    check_data(w.x, torch.stack(xs), label=f'{name} fallback x')
+    check_data(w.u, torch.stack(us64), label=f'{name} fallback u')
+    check_data(w.truncate(2).u, torch.stack(us64)[:, :2], label=f'{name} fallback truncate u')
+
+    # No controls
+    w = cls.collate([cls(_x, None, *args) for _x in xs])
+    assert not w.is_fused() and w.u is None, f"{name} no controls: fused"
+    check_data(w.x, torch.stack(xs), label=f'{name} no controls x')
@@ -0,0 +1,30 @@
+import numpy as np
+from scipy.interpolate import interp1d
+import torch
+
+from dymad.utils import ControlInterpolator
+
+def check_data(out, ref, label=''):
+    assert np.allclose(out, ref), f"{label} failed: {out} != {ref}"
+
+t = np.linspace(0, 2, 11)
+u = np.stack([
+    np.stack([np.sin(3*t), np.cos(t)], axis=-1),
+    np.stack([t**3, np.exp(-t)], axis=-1)])     # (2, 11, 2)
+tq = [0.0, 0.13, 0.5, 1.0, 1.77, 2.0, 2.1]      # Including knots and extrapolation
+
+_t, _u = torch.tensor(t), torch.tensor(u)
+
+# Cubic, against scipy
+interp = ControlInterpolator(_t, _u, order='cubic')
+spl = interp1d(t, u, kind='cubic', axis=-2, fill_value="extrapolate", assume_sorted=True)
+for _q in tq:
+    out = interp(torch.tensor(_q, dtype=_t.dtype)).numpy()
+    check_data(out, spl(_q), label=f'Cubic at {_q}')
+
+# Linear, against scipy
+interp = ControlInterpolator(_t, _u, order='linear')
+spl = interp1d(t, u, kind='linear', axis=-2, assume_sorted=True)
+for _q in tq[:-1]:
+    out = interp(torch.tensor(_q, dtype=_t.dtype)).numpy()
+    check_data(out, spl(_q), label=f'Linear at {_q}')
@@ -0,0 +1,40 @@
+import torch
+
+from dymad.data import DynData
+from dymad.models import LDM
+
+def check_data(out, ref, label='', atol=1e-6):
+    assert out.shape == ref.shape, f"{label} failed: shape {out.shape} != {ref.shape}"
+    assert out.dtype == ref.dtype, f"{label} failed: dtype {out.dtype} != {ref.dtype}"
+    assert torch.allclose(out, ref, atol=atol, rtol=atol), f"{label} failed: {out} != {ref}"
+
+torch.manual_seed(0)
+n_x, n_u = 3, 2
+data_meta = {
+    'n_total_state_features'   : n_x,
+    'n_total_control_features' : n_u,
+    'n_total_features'         : n_x+n_u}
+model = LDM({'latent_dimension': 8, 'encoder_layers': 2}, data_meta)
+model.eval()
+
+x = torch.randn(4, 6, n_x)
+u = torch.randn(4, 6, n_u)
+
+# Split first layer vs concatenated input
+with torch.no_grad():
+    ref = model.encoder_net(torch.cat([x, u], dim=-1))
+    out = model.encoder_net.forward_cat(x, u)
+check_data(out, ref, label='forward_cat')
+
+# Encoder under inference mode takes the forward_cat path
+with torch.inference_mode():
+    out = model.encoder(DynData(x, u))
+check_data(out, ref, label='Encoder, inference mode')
+
+# Reduced precision copy: forward_cat bypasses the cast hooks and casts on its own
+mdl_bf = model.to_inference(torch.bfloat16)
+with torch.no_grad():
+    ref_bf = mdl_bf.encoder_net(torch.cat([x, u], dim=-1))
+    out_bf = mdl_bf.encoder_net.forward_cat(x, u)
+check_data(out_bf, ref_bf, label='forward_cat, bfloat16', atol=5e-2)
+check_data(out_bf, ref, label='forward_cat, bfloat16 vs float32', atol=5e-2)
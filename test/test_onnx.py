@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+import pytest
+import torch
+
+ort = pytest.importorskip("onnxruntime")
+
+from dymad.models import GLDM, LDM, run_onnx
+
+def check_data(out, ref, label=''):
+    assert out.shape == ref.shape, f"{label} failed: shape {out.shape} != {ref.shape}"
+    assert torch.allclose(out, ref, atol=1e-5), f"{label} failed: {out} != {ref}"
+
+torch.manual_seed(0)
+B = 5
+n_nodes, n_x, n_u = 4, 2, 1
+tmp = tempfile.mkdtemp()
+
+# LDM, exported with batch size 1 and run with batch size B
+data_meta = {
+    'n_total_state_features'   : n_x,
+    'n_total_control_features' : n_u,
+    'n_total_features'         : n_x+n_u}
+model = LDM({'latent_dimension': 8}, data_meta)
+model.train()
+
+path = os.path.join(tmp, 'ldm.onnx')
+model.export_onnx(path)
+assert model.training, "export_onnx did not restore training mode"
+
+x, u = torch.randn(B, n_x), torch.randn(B, n_u)
+model.eval()
+with torch.no_grad():
+    ref = model._raw_forward(x, u)
+out = run_onnx(ort.InferenceSession(path), x, u)
+for _o, _r, _l in zip(out, ref, ['z', 'z_dot', 'x_hat']):
+    check_data(_o, _r, label=f'LDM {_l}')
+
+# GLDM, shared graph
+data_meta = {
+    'n_total_state_features'   : n_nodes*n_x,
+    'n_total_control_features' : n_nodes*n_u,
+    'n_total_features'         : n_nodes*(n_x+n_u),
+    'config'                   : {'data': {'n_nodes': n_nodes}}}
+model = GLDM({'latent_dimension': 4, 'activation': 'none'}, data_meta)
+ei = torch.tensor([[[0, 1, 2, 3], [1, 2, 3, 0]]])
+
+path = os.path.join(tmp, 'gldm.onnx')
+model.export_onnx(path, ei)
+
+x, u = torch.randn(B, n_nodes*n_x), torch.randn(B, n_nodes*n_u)
+model.eval()
+with torch.no_grad():
+    ref = model._raw_forward(x, u, ei)
+out = run_onnx(ort.InferenceSession(path), x, u, ei)
+for _o, _r, _l in zip(out, ref, ['z', 'z_dot', 'x_hat']):
+    check_data(_o, _r, label=f'GLDM {_l}')